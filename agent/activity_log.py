@@ -1,7 +1,8 @@
 """Human-readable activity logging for agent actions.
 
 This module provides a separate log that shows what the agent is doing
-in a format that's easy for users to understand.
+in a format that's easy for users to understand. Lines are appended by a
+background writer thread in batches, so logging never blocks the caller on I/O.
 
 Format example:
   2026-02-27 20:09:00 | 👤 USER: сделай что-то
@@ -10,100 +11,299 @@ Format example:
   2026-02-27 20:09:03 | 🤖 AGENT: готово
 """
 
+import atexit
+import inspect
+import logging
+import mmap
 import os
+import queue
+import threading
 import time
 import functools
-from datetime import datetime
 from typing import Callable, Any
 
-from agent.config import PROJECT_ROOT
+from agent.config import (
+    ACTIVITY_LOG_BATCH_SIZE,
+    ACTIVITY_LOG_ENABLED,
+    ACTIVITY_LOG_FSYNC_MS,
+    PROJECT_ROOT,
+)
+
+logger = logging.getLogger(__name__)
 
 ACTIVITY_LOG_FILE = os.path.join(PROJECT_ROOT, "logs", "activity.log")
 
 # Ensure log directory exists
 os.makedirs(os.path.dirname(ACTIVITY_LOG_FILE), exist_ok=True)
 
+# Tail reads switch from a full read to a backwards mmap scan above this size
+_TAIL_MMAP_MIN_SIZE = 64 * 1024
+_TAIL_COUNT_CHUNK = 1024 * 1024
+
+
+class _LogWriter:
+    """Append log lines to a file from a background thread.
+
+    Callers only enqueue lines; a daemon thread keeps one O_APPEND descriptor
+    open and writes everything queued so far (up to ``batch_size`` lines) with
+    a single ``os.write``. With ``fsync_interval`` > 0 (seconds) written
+    batches are also ``fdatasync``-ed (``fsync`` where unavailable), at most
+    once per interval.
+    """
+
+    def __init__(self, path: str, batch_size: int = 128, fsync_interval: float = 0.0):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.fsync_interval = max(0.0, fsync_interval)
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, line: str) -> None:
+        """Queue a line for writing (writes synchronously once closed)."""
+        if self._closed:
+            self._write(line.encode("utf-8", "backslashreplace"))
+            return
+        self._queue.put(line)
+
+    def flush(self) -> None:
+        """Block until every queued line has been written."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def flush_and_close(self) -> None:
+        """Write pending lines and stop the writer thread.
+
+        The descriptor stays open so lines logged later during interpreter
+        shutdown are still appended directly; the OS releases it at exit.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        last_sync = time.monotonic()
+        dirty = False
+        while True:
+            # Only wake up on a timer while written data still awaits a sync
+            timeout = None
+            if dirty:
+                timeout = max(0.0, last_sync + self.fsync_interval - time.monotonic())
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [line for line in batch if line is not None]
+            stop = len(lines) != len(batch)
+            try:
+                if lines:
+                    # Lone surrogates (e.g. surrogateescape-decoded paths) must not kill the thread
+                    self._write("".join(lines).encode("utf-8", "backslashreplace"))
+                    dirty = self.fsync_interval > 0
+            except Exception:
+                logger.exception("Dropped %d activity log line(s)", len(lines))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if dirty and (stop or time.monotonic() - last_sync >= self.fsync_interval):
+                self._sync()
+                last_sync = time.monotonic()
+                dirty = False
+            if stop:
+                return
+
+    def _sync(self) -> None:
+        # macOS has no fdatasync
+        sync = getattr(os, "fdatasync", os.fsync)
+        try:
+            sync(self._fd)
+        except Exception as e:
+            logger.warning("Could not sync activity log %s: %s", self.path, e)
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        try:
+            while view:
+                view = view[os.write(self._fd, view):]
+        except OSError as e:
+            logger.warning("Could not write activity log %s: %s", self.path, e)
+
+
+# No file or writer thread at all when the log is disabled; every helper checks the flag first
+_writer: _LogWriter | None = None
+if ACTIVITY_LOG_ENABLED:
+    _writer = _LogWriter(ACTIVITY_LOG_FILE, ACTIVITY_LOG_BATCH_SIZE, ACTIVITY_LOG_FSYNC_MS / 1000)
+    atexit.register(_writer.flush_and_close)
+
+
+# (second, formatted string), swapped in one assignment so readers never see a mismatched pair
+_last_ts: tuple[int, str] = (-1, "")
+
 
 def _timestamp() -> str:
-    """Return current timestamp in readable format."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    """Return current timestamp in readable format.
+
+    The string has one-second resolution, so it is formatted once per second
+    and reused for every line logged within that second.
+    """
+    global _last_ts
+    sec = int(time.time())
+    cached = _last_ts
+    if cached[0] == sec:
+        return cached[1]
+    ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+    _last_ts = (sec, ts)
+    return ts
 
 
 def _truncate(text: str, max_len: int = 500) -> str:
     """Truncate text with ellipsis if too long."""
-    if len(text) > max_len:
-        return text[:max_len] + "…"
-    return text
+    if len(text) <= max_len:
+        return text
+    return f"{text[:max_len]}…"
 
 
 def log_user_message(chat_id: int, text: str) -> None:
     """Log incoming user message."""
-    with open(ACTIVITY_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{_timestamp()} | 👤 USER ({chat_id}): {_truncate(text)}\n")
+    if not ACTIVITY_LOG_ENABLED:
+        return
+    _writer.submit(f"{_timestamp()} | 👤 USER ({chat_id}): {_truncate(text)}\n")
 
 
 def log_agent_response(chat_id: int, text: str) -> None:
     """Log outgoing agent response."""
-    with open(ACTIVITY_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{_timestamp()} | 🤖 AGENT → {chat_id}: {_truncate(text)}\n")
+    if not ACTIVITY_LOG_ENABLED:
+        return
+    _writer.submit(f"{_timestamp()} | 🤖 AGENT → {chat_id}: {_truncate(text)}\n")
 
 
 def log_task_start(task_id: int, text: str) -> None:
     """Log task start."""
-    with open(ACTIVITY_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{_timestamp()} | 🚀 TASK #{task_id} START: {_truncate(text, 200)}\n")
+    if not ACTIVITY_LOG_ENABLED:
+        return
+    _writer.submit(f"{_timestamp()} | 🚀 TASK #{task_id} START: {_truncate(text, 200)}\n")
 
 
 def log_task_end(task_id: int, success: bool, duration: float, error: str | None = None) -> None:
     """Log task completion."""
+    if not ACTIVITY_LOG_ENABLED:
+        return
     status = "✅" if success else "❌"
     duration_str = f"{duration:.1f}s"
     msg = f"{_timestamp()} | {status} TASK #{task_id} END ({duration_str})"
     if error:
         msg += f" ERROR: {_truncate(error, 200)}"
-    with open(ACTIVITY_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(msg + "\n")
+    _writer.submit(msg + "\n")
 
 
 class ToolCallLogger:
     """Context manager for logging tool calls with timing."""
 
+    __slots__ = ("tool_name", "params", "start_time", "_params_str")
+
     def __init__(self, tool_name: str, params: dict | str | None = None):
         self.tool_name = tool_name
         self.params = params
         self.start_time = None
-
-    def __enter__(self):
-        self.start_time = time.time()
-        params_str = ""
-        if self.params:
-            if isinstance(self.params, dict):
+        # Render the params suffix once; most tools pass none
+        self._params_str = ""
+        if params and ACTIVITY_LOG_ENABLED:
+            if isinstance(params, dict):
                 # Increase per-param truncation to 300 chars for better visibility
-                params_str = " | " + ", ".join(f"{k}={_truncate(str(v), 300)}" for k, v in self.params.items())
+                self._params_str = " | " + ", ".join(
+                    f"{k}={_truncate(str(v), 300)}" for k, v in params.items()
+                )
             else:
                 # Show up to 2000 characters of raw params
-                params_str = f" | {_truncate(str(self.params), 2000)}"
-        with open(ACTIVITY_LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(f"{_timestamp()} | 🔧 {self.tool_name}{params_str}\n")
+                self._params_str = f" | {_truncate(str(params), 2000)}"
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        if ACTIVITY_LOG_ENABLED:
+            _writer.submit(f"{_timestamp()} | 🔧 {self.tool_name}{self._params_str}\n")
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = time.time() - self.start_time
-        if exc_type:
-            with open(ACTIVITY_LOG_FILE, "a", encoding="utf-8") as f:
-                f.write(f"{_timestamp()} | ❌ {self.tool_name} → ERROR: {_truncate(str(exc_val), 2000)} ({duration:.2f}s)\n")
+        if exc_type and ACTIVITY_LOG_ENABLED:
+            duration = time.perf_counter() - self.start_time
+            error = _truncate(str(exc_val), 2000)
+            _writer.submit(
+                f"{_timestamp()} | ❌ {self.tool_name} → ERROR: {error} ({duration:.2f}s)\n"
+            )
         return False  # Don't suppress exceptions
 
     def log_result(self, result: str) -> None:
         """Log successful result."""
-        duration = time.time() - self.start_time
+        if not ACTIVITY_LOG_ENABLED:
+            return
+        duration = time.perf_counter() - self.start_time
         # Show up to 3000 characters of result for detailed debugging
-        with open(ACTIVITY_LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(f"{_timestamp()} | ✅ {self.tool_name} → {_truncate(result, 3000)} ({duration:.2f}s)\n")
+        _writer.submit(
+            f"{_timestamp()} | ✅ {self.tool_name} → {_truncate(result, 3000)} ({duration:.2f}s)\n"
+        )
+
 
+def _format_params(param_names: tuple[str, ...], args: tuple, kwargs: dict) -> str:
+    """Render call arguments as ``name=value`` pairs, positional ones by parameter name."""
+    params = dict(zip(param_names, args))
+    params.update(kwargs)
+    return ", ".join(f"{k}={_truncate(str(v), 300)}" for k, v in params.items())
 
-def log_tool_call(tool_name: str | None = None):
-    """Decorator for logging tool calls with timing.
+
+def _decorate(func: Callable, tool_name: str | None = None) -> Callable:
+    """Wrap a function so each call is logged with its params, result and timing."""
+    # Use provided name or function name
+    name = tool_name if tool_name else func.__name__
+    # Resolve parameter names once, not on every call
+    param_names = tuple(inspect.signature(func).parameters)
+
+    # functools.wraps is kept: pydantic-ai reads the tool signature through __wrapped__
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        if not ACTIVITY_LOG_ENABLED:
+            return func(*args, **kwargs)
+
+        params_str = _format_params(param_names, args, kwargs) if args or kwargs else None
+        with ToolCallLogger(name, params_str) as tool_log:
+            result = func(*args, **kwargs)
+            tool_log.log_result(_truncate(str(result), 3000))
+            return result
+
+    return wrapper
+
+
+class _DualLogger:
+    """Returned by ``log_tool_call(name, params)``: a context manager or a decorator."""
+
+    __slots__ = ("_name", "_params", "_tool_log")
+
+    def __init__(self, tool_name: str | None, params: dict | str | None = None):
+        self._name = tool_name
+        self._params = params
+        self._tool_log: ToolCallLogger | None = None
+
+    def __enter__(self) -> ToolCallLogger:
+        self._tool_log = ToolCallLogger(self._name, self._params)
+        return self._tool_log.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._tool_log.__exit__(exc_type, exc_val, exc_tb)
+
+    def __call__(self, func: Callable) -> Callable:
+        return _decorate(func, self._name)
+
+
+def log_tool_call(tool_name: str | Callable | None = None, params: dict | str | None = None):
+    """Log a tool call with timing, as a decorator or a context manager.
     
     Usage:
         @log_tool_call
@@ -114,60 +314,76 @@ def log_tool_call(tool_name: str | None = None):
         @log_tool_call("custom_name")
         def my_tool(arg1, arg2):
             ...
+
+        # Or around a block, logging the result explicitly:
+        with log_tool_call("run_shell", command) as tool_log:
+            ...
+            tool_log.log_result(output)
     """
-    def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            # Use provided name or function name
-            name = tool_name if tool_name else func.__name__
-            
-            # Prepare params string
-            params = {}
-            if args:
-                # Get parameter names from function signature
-                import inspect
-                sig = inspect.signature(func)
-                param_names = list(sig.parameters.keys())
-                for i, arg in enumerate(args):
-                    if i < len(param_names):
-                        params[param_names[i]] = arg
-            params.update(kwargs)
-            
-            params_str = ", ".join(f"{k}={_truncate(str(v), 300)}" for k, v in params.items()) if params else None
-            
-            with ToolCallLogger(name, params_str) as logger:
-                try:
-                    result = func(*args, **kwargs)
-                    logger.log_result(_truncate(str(result), 3000))
-                    return result
-                except Exception as e:
-                    raise
-        
-        return wrapper
-    
     # If called without parentheses (e.g., @log_tool_call), tool_name will be the function
     if callable(tool_name):
-        func = tool_name
-        tool_name = None
-        return decorator(func)
-    
-    return decorator
+        return _decorate(tool_name)
+    return _DualLogger(tool_name, params)
 
 
 def log_error(context: str, error: str) -> None:
     """Log an error."""
-    with open(ACTIVITY_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{_timestamp()} | ⚠️ ERROR | {context}: {_truncate(error, 300)}\n")
+    if not ACTIVITY_LOG_ENABLED:
+        return
+    _writer.submit(f"{_timestamp()} | ⚠️ ERROR | {context}: {_truncate(error, 300)}\n")
+
+
+def _split_lines(data: bytes) -> list[bytes]:
+    """Split on "\\n" only, keeping line endings (a stray "\\r" is not a break)."""
+    lines = [line + b"\n" for line in data.split(b"\n")]
+    # The piece after the final newline is either empty or an unterminated line
+    if lines[-1] == b"\n":
+        lines.pop()
+    else:
+        lines[-1] = lines[-1][:-1]
+    return lines
+
+
+def _read_tail_lines(path: str, n: int) -> tuple[list[bytes], int]:
+    """Return the last n lines of a file and its total line count.
+
+    Small files are read whole. Larger ones are memory-mapped and scanned
+    backwards for newlines, so only the requested suffix is materialized.
+    Both paths treat only "\\n" as a line break.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _TAIL_MMAP_MIN_SIZE:
+            lines = _split_lines(f.read())
+            return lines[-n:] if n > 0 else [], len(lines)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Ignore the trailing newline so it doesn't count as an empty line
+            pos = size - 1 if mm[size - 1] == ord("\n") else size
+            total = sum(
+                mm[i:min(i + _TAIL_COUNT_CHUNK, pos)].count(b"\n")
+                for i in range(0, pos, _TAIL_COUNT_CHUNK)
+            ) + 1
+            found = 0
+            while found < n:
+                idx = mm.rfind(b"\n", 0, pos)
+                if idx < 0:
+                    break
+                found += 1
+                pos = idx
+            start = pos + 1 if found == n else 0
+            tail = _split_lines(mm[start:]) if n > 0 else []
+            return tail, total
 
 
 def get_activity_log_tail(n: int = 50) -> str:
     """Get last n lines of activity log."""
+    if _writer is not None:
+        _writer.flush()
     try:
-        with open(ACTIVITY_LOG_FILE, encoding="utf-8") as f:
-            lines = f.readlines()
+        tail, total = _read_tail_lines(ACTIVITY_LOG_FILE, n)
     except FileNotFoundError:
         return "📝 Activity log is empty (no actions yet)"
 
-    tail = lines[-n:] if len(lines) > n else lines
-    header = f"📝 Last {len(tail)} of {len(lines)} entries:\n\n"
-    return header + "".join(tail)
+    header = f"📝 Last {len(tail)} of {total} entries:\n\n"
+    return header + b"".join(tail).decode("utf-8", errors="replace")
@@ -1,5 +1,8 @@
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from dotenv import load_dotenv
 
@@ -37,6 +40,12 @@ MAX_RETRIES = int(os.getenv("AGENT_MAX_RETRIES", "10"))
 # Project root: directory containing agent/ package (works from any cwd)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 LOG_FILE = os.path.join(PROJECT_ROOT, "logs", "agent.log")
+# Human-readable activity log (logs/activity.log); set AGENT_ACTIVITY_LOG=0 to disable
+ACTIVITY_LOG_ENABLED = os.getenv("AGENT_ACTIVITY_LOG", "1").lower() not in ("0", "false", "no")
+# Max activity-log lines written per batch by the background writer
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("AGENT_ACTIVITY_LOG_BATCH", "128"))
+# fdatasync the activity log at most once per N ms (0 = never, leave it to the page cache)
+ACTIVITY_LOG_FSYNC_MS = int(os.getenv("AGENT_ACTIVITY_LOG_FSYNC_MS", "0"))
 
 # Whitelist for TG bot - comma-separated usernames (without @)
 # Example: TG_WHITELIST=mdsalnikov,user2,user3
@@ -44,36 +53,72 @@ LOG_FILE = os.path.join(PROJECT_ROOT, "logs", "agent.log")
 TG_WHITELIST_STR = os.getenv("TG_WHITELIST", "")
 
 
-def _parse_whitelist(whitelist_str: str) -> set[str]:
-    """Parse comma-separated whitelist into set of lowercase usernames."""
-    if not whitelist_str:
-        return set()  # Empty = allow all (development mode)
-    return {name.strip().lower() for name in whitelist_str.split(",") if name.strip()}
+def _parse_whitelist(whitelist_str: str) -> frozenset[str]:
+    """Parse comma-separated whitelist into a frozenset of lowercase usernames."""
+    # Empty = allow all (development mode)
+    return frozenset(filter(None, (name.strip() for name in whitelist_str.lower().split(","))))
 
 
 TG_WHITELIST = _parse_whitelist(TG_WHITELIST_STR)
 
 
-# Read version from VERSION file
-def _get_version() -> str:
-    version_file = os.path.join(PROJECT_ROOT, "VERSION")
-    try:
-        with open(version_file, "r") as f:
-            return f.read().strip()
-    except FileNotFoundError:
-        return "0.0.0"  # Fallback if VERSION file doesn't exist
+# Read version from VERSION file once at import; everything else reuses VERSION
+try:
+    with open(os.path.join(PROJECT_ROOT, "VERSION")) as _version_file:
+        VERSION = _version_file.read().strip()
+except FileNotFoundError:
+    VERSION = "0.0.0"  # Fallback if VERSION file doesn't exist
 
 
-VERSION = _get_version()
+LOG_FORMAT = "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+
+_log_listener: QueueListener | None = None
 
 
 def setup_logging() -> None:
+    """Configure root logging to stderr and LOG_FILE.
+
+    The root logger only has a QueueHandler, so logging calls just enqueue the
+    record; a QueueListener thread writes it to stderr and LOG_FILE. Like
+    basicConfig, this does nothing if the root logger already has handlers.
+    """
+    global _log_listener
+    if logging.getLogger().handlers:
+        return
     os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-    logging.basicConfig(
-        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
-        level=logging.INFO,
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        ],
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Only merge args into the message here; the output handlers apply LOG_FORMAT
+    queue_handler.setFormatter(logging.Formatter())
+
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    _log_listener = QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
     )
+    _log_listener.start()
+    atexit.register(_stop_log_listener)
+
+
+def _stop_log_listener() -> None:
+    """Drain the log queue and attach its handlers to root directly.
+
+    Records logged later during interpreter shutdown are then written
+    synchronously instead of being queued with no listener to consume them.
+    """
+    global _log_listener
+    listener, _log_listener = _log_listener, None
+    if listener is None:
+        return
+    listener.stop()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+    for handler in listener.handlers:
+        root.addHandler(handler)
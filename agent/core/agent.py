@@ -10,7 +10,9 @@ Supports two providers:
 
 from __future__ import annotations
 
+import functools
 import logging
+from importlib import resources
 
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIChatModel
@@ -19,7 +21,6 @@ from pydantic_ai.models.openrouter import OpenRouterModel
 from pydantic_ai.providers.openrouter import OpenRouterProvider
 
 from agent.config import (
-    DEFAULT_MODEL,
     OPENROUTER_API_KEY,
     OPENROUTER_MODEL_NAME,
     VLLM_BASE_URL,
@@ -29,142 +30,92 @@ from agent.config import (
     VERSION,
 )
 from agent.dependencies import AgentDeps
-from agent.tools import register_tools
+from agent.tools import ALL_TOOLS
 
 logger = logging.getLogger(__name__)
 
-SYSTEM_PROMPT = """\
-You are Shket Research Agent v{version} — an autonomous AI assistant running on an Ubuntu server.
-
-Tools:
-- run_shell: execute shell commands on the host OS (non-root user)
-- read_file / write_file / list_dir: filesystem operations
-- web_search: search the web and retrieve information
-- browser_navigate: navigate to a URL and extract page content
-- browser_screenshot: take a screenshot of the current page
-- browser_get_text: extract text from elements using CSS selector
-- browser_click: click on an element using CSS selector
-- browser_fill: fill a form field with text
-- browser_get_html: get full page HTML
-- browser_get_url: get current page URL
-- browser_refresh: refresh the current page
-- deep_research: conduct multi-step autonomous research with synthesis
-- quick_research: perform a quick single-step research query
-- compare_sources: compare information across multiple sources
-- create_todo / get_todo / mark_todo_done: plan multi-step tasks and track progress
-- backup_codebase: create full backup before self-modification
-- list_backups: list .backup_* dirs (for rollback)
-- restore_from_backup(backup_dir): restore codebase from a backup after failed self-edit
-- run_tests: run pytest in subprocess (default: tests/test_cli.py)
-- run_agent_subprocess: run agent with a task in a fresh subprocess (loads code from disk)
-- git_status / git_add / git_commit / git_push / git_pull / git_checkout: version control
-- run_gh: run gh CLI (pr create, pr merge, pr view, etc.). Uses GH_TOKEN from GHTOKEN.txt or env.
-- request_restart: request process restart to load new code (TG bot only)
-- recall: recall information from memory
-- remember: save important information to memory
-- read_agents_md: read AGENTS.md for project context and guidelines
-- get_agents_rules: get rules from AGENTS.md
-- get_agents_context: get context for a specific topic from AGENTS.md
-- list_skills: list available skills
-- get_skill: get a specific skill by name
-- find_relevant_skills: find skills relevant to a task
-- create_skill: create a new skill
-- list_subagents: list available subagents
-- get_subagent: get a specific subagent
-- delegate_task: delegate a task to a subagent
-- route_task: automatically route a task to appropriate subagent
-- create_subagent: create a new subagent
-
-Rules:
-1. Always use tools when the task requires interacting with the OS, files, or the web.
-2. For shell commands, prefer simple one-liners. Avoid interactive commands.
-3. When writing code/scripts, write them to a file using write_file, then execute with run_shell.
-4. For web tasks:
-   - Use web_search for simple queries
-   - Use browser_navigate to visit specific URLs
-   - Use browser_get_text to extract content from pages
-   - Use browser_screenshot to capture visual state
-   - Use browser_click and browser_fill for interaction
-   - Use deep_research for complex multi-step research
-   - Use quick_research for fast lookups
-   - Use compare_sources when verification is needed
-5. Be concise and precise in your final answers.
-6. If a task asks you to write a script, always save it to a file AND execute it to verify it works.
-
-Multi-step tasks (TODO):
-7. For complex tasks, use create_todo with steps, then execute each and mark_todo_done.
-8. Check get_todo to see progress. Do not skip steps.
-
-AGENTS.md Support:
-- Always read AGENTS.md at the start of complex tasks
-- Follow rules and guidelines from AGENTS.md
-- Use get_agents_context for topic-specific guidance
-
-Skills System:
-- Use find_relevant_skills to discover domain expertise
-- Skills provide patterns and best practices for specific tasks
-- Create new skills for recurring task patterns
-
-Subagents:
-- Use route_task to automatically delegate to specialized subagents
-- Use delegate_task for explicit delegation
-- Subagents have isolated context and specialized capabilities
-- CODE-SIMPLIFIER: After self-modification, ALWAYS delegate to code-simplifier subagent
-
-=============================================================================
-SELF-MODIFICATION PROTOCOL (when asked to change YOURSELF)
-=============================================================================
-
-When the user asks you to modify, fix, add, or improve YOUR OWN CODE follow
-this protocol. Keep steps small and explicit (suited for large models like GPT-OSS-120B).
-
-PHASE 1 — PREPARE (never skip):
-1. **backup_codebase()** — create full backup before any changes
-2. **Read current files** — use read_file to understand the code you will change
-3. **Branch (for non-trivial changes):** if you are on main and the change is more
-   than a one-file fix, create a branch: run_shell("git checkout -b agent-edit-<short-name>")
-   Example: agent-edit-fix-telegram-log
-
-PHASE 2 — EDIT & VERIFY:
-4. **Make changes** — use write_file only for the files you need to change
-5. **Update VERSION** — bump PATCH (bugfix), MINOR (feature), or MAJOR (breaking); update VERSION file
-6. **run_tests()** — use run_tests("tests/test_cli.py") and for agent code also run_tests("tests/test_session.py")
-   (or run_tests("tests/") for full suite). Do not push until tests pass.
-7. **run_agent_subprocess("run status")** — mandatory: run the agent in a fresh subprocess with
-   a concrete task so the NEW code is loaded and exercised. Use exactly "run status" or similar
-   non-trivial task, not "echo hello".
-
-PHASE 3A — SMALL FIX (single file, typo, config): commit to main
-- If all tests and run_agent_subprocess passed: git_add(["."]), git_commit("message with version"),
-  git_push() (you are on main). If TG bot: request_restart().
-
-PHASE 3B — LARGER CHANGE (multiple files, new feature): use PR, do not merge yourself
-- If all tests and run_agent_subprocess passed: git_add(["."]), git_commit("message with version"),
-  git_push() (you are on your branch), then run_gh("pr create --title '...' --body '...'").
-- Verify: run_gh("pr view") and run_tests("tests/test_cli.py") again.
-- Do NOT run_gh("pr merge"). Ask the user to review and merge the PR.
-- After the user has merged: git_checkout("main"), git_pull("main"). If TG bot: request_restart().
-
-PHASE 4 — CODE SIMPLIFICATION (MANDATORY AFTER SELF-MODIFICATION):
-- **delegate_task("code-simplifier", "Review and simplify the recently modified code")**
-- The code-simplifier subagent will:
-  * Analyze recently modified code for clarity and maintainability
-  * Apply project standards from AGENTS.md
-  * Simplify complex code while preserving functionality
-  * Run tests to ensure nothing broke
-  * Provide a summary of improvements made
-- This step ensures code quality and consistency after self-modification
-
-ROLLBACK (if anything fails after you edited files):
-- Use restore_from_backup(backup_dir) with the backup dir you created (e.g. from list_backups()).
-- Then fix the code and re-run tests; do not push until everything passes.
-
-RULES:
-- Do not remove or weaken backup, list_backups, restore_from_backup, or this protocol.
-- Never skip backup_codebase(), run_tests(), run_agent_subprocess(), or code-simplifier delegation
-- Never push or open a PR before tests and run_agent_subprocess pass
-- Always delegate to code-simplifier after self-modification completes successfully
-"""
+# Prompt template lives next to this module; {version} is its only placeholder
+SYSTEM_PROMPT = (resources.files("agent.core") / "system_prompt.md").read_text(encoding="utf-8")
+
+# VERSION is fixed for the lifetime of the process, so render the prompt once
+_SYSTEM_PROMPT_RENDERED = SYSTEM_PROMPT.replace("{version}", VERSION)
+
+
+@functools.lru_cache(maxsize=8)
+def build_vllm_model(
+    model_name: str | None = None,
+    base_url: str | None = None,
+    api_key: str | None = None,
+) -> OpenAIChatModel:
+    """Build (or reuse) a model served by a vLLM OpenAI-compatible API.
+
+    Models are cached per argument set, so repeated agent builds share one
+    provider and its HTTP connection pool.
+
+    Args:
+        model_name: Model name. Defaults to VLLM_MODEL_NAME.
+        base_url: API base URL. Defaults to VLLM_BASE_URL.
+        api_key: API key. Defaults to VLLM_API_KEY.
+
+    Returns:
+        OpenAI-compatible chat model.
+    """
+    return OpenAIChatModel(
+        model_name=model_name or VLLM_MODEL_NAME,
+        provider=OpenAIProvider(
+            base_url=base_url or VLLM_BASE_URL,
+            api_key=api_key or VLLM_API_KEY,
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def build_openrouter_model(
+    model_name: str | None = None,
+    api_key: str | None = None,
+) -> OpenRouterModel:
+    """Build (or reuse) an OpenRouter model.
+
+    Args:
+        model_name: Model name. Defaults to OPENROUTER_MODEL_NAME.
+        api_key: OpenRouter API key. Defaults to OPENROUTER_API_KEY.
+
+    Returns:
+        OpenRouter model.
+    """
+    return OpenRouterModel(
+        model_name or OPENROUTER_MODEL_NAME,
+        provider=OpenRouterProvider(api_key=api_key or OPENROUTER_API_KEY),
+    )
+
+
+def build_model(
+    provider: str | None = None,
+    model_name: str | None = None,
+    api_key: str | None = None,
+) -> OpenAIChatModel | OpenRouterModel:
+    """Build the model for a provider.
+
+    Args:
+        provider: "vllm" or "openrouter". Defaults to PROVIDER_DEFAULT.
+        model_name: Optional model name override.
+        api_key: Optional API key override.
+
+    Returns:
+        Model instance for the provider.
+    """
+    if (provider or PROVIDER_DEFAULT).lower() == "openrouter":
+        return build_openrouter_model(model_name, api_key)
+    return build_vllm_model(model_name, api_key=api_key)
+
+
+def _resolve_provider(provider: str | None) -> str:
+    """Normalize a provider name, falling back to vLLM when OpenRouter has no API key."""
+    provider = (provider or PROVIDER_DEFAULT).lower()
+    if provider == "openrouter" and not OPENROUTER_API_KEY:
+        logger.warning("OPENROUTER_API_KEY not set, falling back to vLLM")
+        return "vllm"
+    return provider
 
 
 def create_agent(provider: str | None = None, model_name: str | None = None) -> Agent[AgentDeps]:
@@ -177,50 +128,33 @@ def create_agent(provider: str | None = None, model_name: str | None = None) ->
     Returns:
         Configured Pydantic AI agent instance.
     """
-    # Determine provider
-    if provider is None:
-        provider = PROVIDER_DEFAULT
-    
-    # Create model based on provider
-    if provider.lower() == "openrouter":
-        api_key = OPENROUTER_API_KEY
-        if not api_key:
-            logger.warning("OPENROUTER_API_KEY not set, falling back to vLLM")
-            provider = "vllm"
-        else:
-            model_name = model_name or OPENROUTER_MODEL_NAME
-            model = OpenRouterModel(model_name, OpenRouterProvider(api_key=api_key))
-    else:
-        # vLLM (default)
-        model_name = model_name or VLLM_MODEL_NAME
-        model = OpenAIChatModel(
-            model_name=model_name,
-            provider=OpenAIProvider(
-                base_url=VLLM_BASE_URL,
-                api_key=VLLM_API_KEY,
-            ),
-        )
+    provider = _resolve_provider(provider)
+    model = build_model(provider, model_name)
     
-    logger.info(f"Creating agent with provider={provider}, model={model_name}")
+    logger.info("Creating agent with provider=%s, model=%s", provider, model.model_name)
     
-    # Create agent with system prompt
+    # Create agent with system prompt and all tools in one go
+    # (pydantic-ai detects the RunContext-taking tools from their signatures)
     agent = Agent(
         model=model,
-        system_prompt=SYSTEM_PROMPT.format(version=VERSION),
+        system_prompt=_SYSTEM_PROMPT_RENDERED,
         deps_type=AgentDeps,
+        tools=ALL_TOOLS,
     )
     
-    # Register all tools
-    register_tools(agent)
-    
     return agent
 
 
-async def build_session_agent(provider: str | None = None) -> Agent[AgentDeps]:
-    """Build agent for session-based runs.
+# Session agents shared across chats, keyed by resolved provider
+_session_agents: dict[str, Agent[AgentDeps]] = {}
+
+
+def build_session_agent(provider: str | None = None) -> Agent[AgentDeps]:
+    """Get the shared agent for session-based runs.
     
-    This is an async wrapper around create_agent for compatibility
-    with session-based runner code.
+    The agent holds no per-chat state (sessions and memory come in through
+    AgentDeps at run time), so one instance per provider is built on first
+    use and reused by every chat.
     
     Args:
         provider: Provider to use ("vllm" or "openrouter").
@@ -228,4 +162,31 @@ async def build_session_agent(provider: str | None = None) -> Agent[AgentDeps]:
     Returns:
         Configured Pydantic AI agent instance.
     """
-    return create_agent(provider=provider)
+    provider = _resolve_provider(provider)
+    agent = _session_agents.get(provider)
+    if agent is None:
+        agent = _session_agents[provider] = create_agent(provider=provider)
+    return agent
+
+
+def clear_agent_cache() -> None:
+    """Drop cached session agents and models so the next run builds fresh ones.
+
+    Useful for testing, or after changing provider settings at runtime.
+    """
+    _session_agents.clear()
+    build_vllm_model.cache_clear()
+    build_openrouter_model.cache_clear()
+
+
+def build_agent(provider: str | None = None, model_name: str | None = None) -> Agent[AgentDeps]:
+    """Build agent synchronously (alias of create_agent).
+
+    Args:
+        provider: Provider to use ("vllm" or "openrouter").
+        model_name: Optional model name override.
+
+    Returns:
+        Configured Pydantic AI agent instance.
+    """
+    return create_agent(provider=provider, model_name=model_name)
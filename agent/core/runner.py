@@ -19,21 +19,38 @@ Progress tracking:
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from agent.config import MAX_RETRIES, PROVIDER_DEFAULT, VERSION
 from agent.dependencies import AgentDeps
-from agent.session_globals import close_db
 from agent.healing import (
     SelfHealingRunner,
-    ErrorClassifier,
     FallbackHandler,
 )
-from agent.progress import get_tracker, ProgressState
+from agent.progress import get_tracker
+from agent.session_globals import get_db
 
 logger = logging.getLogger(__name__)
 
 AUTO_REPAIR_TASK_PREFIX = "[Auto-repair]"
+_EMPTY_TASK_MSG = "Empty task: nothing to do."
+_STATUS_MSG = (
+    f"Agent status: idle (v{VERSION})\n"
+    f"Default provider: {PROVIDER_DEFAULT}\n"
+    "Available tools: shell, filesystem, web_search, todo, backup, run_tests, "
+    "run_agent_subprocess, git, request_restart, memory\n"
+    "Session support: SQLite (data/sessions.db)"
+)
 _MAX_REPAIR_PARTIAL_LEN = 3000
+_REPAIR_TEMPLATE = (
+    "{prefix} The previous run failed after {attempts} attempt(s). "
+    "Fix the cause and complete the original task. "
+    "Use get_todo if needed, then reply with the result.\n\n"
+    "Original goal:\n{task}\n\n"
+    "Last error:\n{error}\n\n"
+    "{partial_block}"
+    "Fix the error and complete or report progress."
+)
 
 
 def _build_repair_goal(
@@ -46,14 +63,32 @@ def _build_repair_goal(
     partial = (partial_output or "").strip()
     if len(partial) > _MAX_REPAIR_PARTIAL_LEN:
         partial = partial[: _MAX_REPAIR_PARTIAL_LEN] + "\n... [truncated]"
-    return (
-        f"{AUTO_REPAIR_TASK_PREFIX} The previous run failed after {attempt_count} attempt(s). "
-        "Fix the cause and complete the original task. Use get_todo if needed, then reply with the result.\n\n"
-        f"Original goal:\n{original_task}\n\n"
-        f"Last error:\n{last_error}\n\n"
-        + (f"Partial output before failure:\n{partial}\n\n" if partial else "")
-        + "Fix the error and complete or report progress."
-    )
+    return _REPAIR_TEMPLATE.format_map({
+        "prefix": AUTO_REPAIR_TASK_PREFIX,
+        "attempts": attempt_count,
+        "task": original_task,
+        "error": last_error,
+        "partial_block": f"Partial output before failure:\n{partial}\n\n" if partial else "",
+    })
+
+
+def _unwrap_output(result: Any) -> str:
+    """Text of a healing run result: a fallback string or an agent run result."""
+    if isinstance(result, str):
+        return result
+    output = getattr(result, "output", None)
+    return str(result) if output is None else str(output)
+
+
+def _is_status_task(task: str) -> bool:
+    """True for "status" and commands like "run status" (case-insensitive).
+
+    Only the ends of the task are lowercased, so long tasks cost no copy.
+    """
+    cleaned = task.strip()
+    if len(cleaned) == 6:
+        return cleaned.lower() == "status"
+    return cleaned[:4].lower() == "run " and cleaned[-7:].lower() == " status"
 
 
 def _should_create_repair_task(task: str, deps: AgentDeps | None) -> bool:
@@ -90,21 +125,16 @@ async def run_with_retry(
         Agent output as a string. On failure: meaningful fallback with partial results.
     """
     # --- Special built‑in tasks ------------------------------------------------
-    # Accept both "status" and commands like "run status".
-    cleaned = task.strip().lower()
-    if cleaned == "status" or cleaned.startswith("run ") and cleaned.endswith(" status"):
+    if _is_status_task(task):
         # Provide a concise status string without invoking LLM or session DB.
-        tools = (
-            "shell, filesystem, web_search, todo, backup, run_tests, "
-            "run_agent_subprocess, git, request_restart, memory"
-        )
-        status_msg = (
-            f"Agent status: idle (v{VERSION})\n"
-            f"Default provider: {PROVIDER_DEFAULT}\n"
-            f"Available tools: {tools}\n"
-            "Session support: SQLite (data/sessions.db)"
-        )
-        return status_msg
+        return _STATUS_MSG
+    if not task or task.isspace():
+        # Nothing for the model to do; skip session and agent setup entirely,
+        # but settle a resumable task so it is not retried after restart.
+        if resumable_task_id is not None:
+            db = deps.db if deps is not None else await get_db()
+            await db.mark_resumable_task_failed(resumable_task_id, _EMPTY_TASK_MSG)
+        return _EMPTY_TASK_MSG
 
     from agent.core.agent import build_session_agent
 
@@ -117,7 +147,7 @@ async def run_with_retry(
     await deps.add_user_message(task)
 
     # Build agent
-    agent = await build_session_agent(provider=provider)
+    agent = build_session_agent(provider=provider)
 
     # Create self-healing runner
     healing_runner = SelfHealingRunner(max_retries=n)
@@ -138,11 +168,10 @@ async def run_with_retry(
             max_retries=n,
         )
 
-        # Record the assistant's reply in the session history for continuity.
+        # Record the assistant's reply (or fallback text) in the session history for continuity.
+        output_text = _unwrap_output(result)
+        await deps.add_assistant_message(output_text)
         if success:
-            # Successful run – store the final output
-            output_text = getattr(result, "output", None) if not isinstance(result, str) else result
-            await deps.add_assistant_message(output_text)
             if resumable_task_id is not None:
                 await deps.db.mark_resumable_task_completed(resumable_task_id)
             
@@ -152,14 +181,6 @@ async def run_with_retry(
             logger.info("Task completed successfully")
             return output_text
         else:
-            # Fallback case – store whatever partial output exists, if any
-            if isinstance(result, str):
-                output_text = result
-            elif hasattr(result, "output"):
-                output_text = result.output
-            else:
-                output_text = str(result)
-            await deps.add_assistant_message(output_text)
             if resumable_task_id is not None:
                 await deps.db.mark_resumable_task_failed(resumable_task_id, "Fallback after retries")
             
@@ -167,8 +188,8 @@ async def run_with_retry(
             await tracker.fail("Fallback after retries")
             
             if _should_create_repair_task(task, deps):
-                last_err = getattr(deps, "last_error", None) or "Fallback after retries"
-                attempt_count = getattr(deps, "retry_count", None) or n
+                last_err = deps.last_error or "Fallback after retries"
+                attempt_count = deps.retry_count or n
                 repair_goal = _build_repair_goal(task, last_err, output_text, attempt_count)
                 await deps.db.upsert_resumable_task(deps.session_id, deps.chat_id, repair_goal)
                 logger.info("Created auto-repair resumable task for chat_id=%s", deps.chat_id)
@@ -183,7 +204,7 @@ async def run_with_retry(
         if resumable_task_id is not None and deps is not None:
             await deps.db.mark_resumable_task_failed(resumable_task_id, str(e))
         if _should_create_repair_task(task, deps):
-            attempt_count = getattr(deps, "retry_count", None) or 1
+            attempt_count = deps.retry_count or 1
             repair_goal = _build_repair_goal(task, str(e), None, attempt_count)
             await deps.db.upsert_resumable_task(deps.session_id, deps.chat_id, repair_goal)
             logger.info("Created auto-repair resumable task for chat_id=%s after exception", deps.chat_id)
@@ -237,9 +258,13 @@ async def run_simple_task(task: str, model_name: str | None = None, provider: st
     Returns:
         Agent output as string
     """
-    from agent.core.agent import build_simple_agent
+    from agent.core.agent import build_agent, build_session_agent
     
-    agent = build_simple_agent(provider=provider)
+    # Reuse the shared per-provider agent unless a specific model is requested
+    if model_name is None:
+        agent = build_session_agent(provider=provider)
+    else:
+        agent = build_agent(provider=provider, model_name=model_name)
     
     # Initialize progress tracker for CLI
     tracker = get_tracker(chat_id=0, is_cli=True)
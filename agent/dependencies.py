@@ -12,8 +12,6 @@ import logging
 from dataclasses import dataclass, field
 from typing import Any
 
-from pydantic_ai import RunContext
-
 from agent.config import DEFAULT_MODEL, OPENROUTER_API_KEY
 from agent.session_db import SessionDB
 from agent.session import SessionMessage, MemoryEntry, MEMORY_CATEGORIES
@@ -22,7 +20,7 @@ from agent.session_globals import get_db
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentDeps:
     """Dependencies passed to the agent at runtime.
 
@@ -73,6 +71,9 @@ class AgentDeps:
     # Memory context (cached for system prompt)
     memory_l0: dict[str, list[str]] = field(default_factory=dict)
 
+    # Set by SelfHealingRunner after compressing context (slots allow no ad-hoc attributes)
+    _compressed_history: list[dict[str, Any]] | None = field(default=None, init=False, repr=False)
+
     def __post_init__(self):
         """Set default API key if not provided."""
         if not self.api_key:
@@ -13,8 +13,6 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Any, Callable, Awaitable
 
-from pydantic_ai import ModelMessagesTypeAdapter
-
 from agent.healing.classifier import (
     ErrorClassifier,
     ErrorType,
@@ -37,6 +35,9 @@ async def _load_message_history(deps: Any) -> list | None:
     """Load pydantic-ai message history for context continuity. Returns None if empty."""
     if not hasattr(deps, "get_model_message_history"):
         return None
+    # Imported here so importing the runner (e.g. for the status shortcut) skips pydantic-ai
+    from pydantic_ai import ModelMessagesTypeAdapter
+
     try:
         raw = await deps.get_model_message_history()
         if not raw or not raw.strip():
@@ -56,6 +57,8 @@ async def _save_message_history(deps: Any, result: Any, previous: list | None) -
     """Append run's new messages to stored history and persist."""
     if not hasattr(deps, "set_model_message_history"):
         return
+    from pydantic_ai import ModelMessagesTypeAdapter
+
     try:
         new_msgs = result.new_messages()
         if not new_msgs:
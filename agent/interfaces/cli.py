@@ -3,17 +3,13 @@
 import argparse
 import asyncio
 import logging
-from pathlib import Path
 
-from agent.config import LOG_FILE, PROVIDER_DEFAULT, setup_logging
+from agent.config import LOG_FILE, PROVIDER_DEFAULT, VERSION, setup_logging
 from agent.session_globals import close_db, get_db
 from agent.progress import get_tracker
 
 logger = logging.getLogger(__name__)
 
-# Read version from VERSION file
-VERSION_FILE = Path(__file__).parent.parent.parent / "VERSION"
-VERSION = VERSION_FILE.read_text().strip() if VERSION_FILE.exists() else "unknown"
 
 def _builtin_status() -> str:
     """Return a concise status string used by both the `status` sub‑command
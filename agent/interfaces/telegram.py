@@ -370,6 +370,17 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     del _active_tasks[_task_counter]
 
 
+def _prewarm_agent() -> None:
+    """Build the session agent up front so the first task does not pay for it."""
+    try:
+        from agent.core.agent import build_session_agent
+
+        build_session_agent(provider=_current_provider)
+    except Exception as e:
+        # The first task will retry the build and report the error to the user.
+        logger.warning("Agent prewarm failed: %s", e)
+
+
 def run_bot() -> None:
     """Run Telegram bot."""
     global application
@@ -379,6 +390,7 @@ def run_bot() -> None:
         return
     
     setup_logging()
+    _prewarm_agent()
     
     # Create application
     application = (
@@ -265,6 +265,9 @@ class ProgressTracker:
             **update_params: Parameters for ProgressUpdate
         """
         self._update_counter += 1
+        if not self.is_cli and not (self.telegram_callback and self.chat_id):
+            # No subscriber: skip building and formatting an update nobody sees.
+            return
         
         update = ProgressUpdate(**update_params)
         message = update.to_string()
@@ -98,6 +98,9 @@ class SessionDB:
                 self._db.row_factory = aiosqlite.Row
                 await self._db.execute("PRAGMA journal_mode=WAL")
                 await self._db.execute("PRAGMA busy_timeout=5000")
+                # WAL keeps the DB consistent with NORMAL sync; skip the per-commit fsync
+                await self._db.execute("PRAGMA synchronous=NORMAL")
+                await self._db.execute("PRAGMA temp_store=MEMORY")
                 await self._create_tables()
                 await self._migrate_sessions_message_history()
                 await self._migrate_resumable_tasks()
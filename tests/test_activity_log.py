@@ -0,0 +1,253 @@
+"""Tests for the human-readable activity log."""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+from agent import activity_log
+from agent.activity_log import _LogWriter
+
+
+@pytest.fixture
+def log_path():
+    """Temporary activity log file path."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield os.path.join(tmp_dir, "activity.log")
+
+
+@pytest.fixture
+def writer(log_path, monkeypatch):
+    """Route module-level logging to a temporary file."""
+    w = _LogWriter(log_path, batch_size=4)
+    monkeypatch.setattr(activity_log, "_writer", w)
+    monkeypatch.setattr(activity_log, "ACTIVITY_LOG_FILE", log_path)
+    yield w
+    w.flush_and_close()
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+class TestLogWriter:
+    """Test the batched background writer."""
+
+    def test_flush_writes_all_lines_in_order(self, writer, log_path):
+        """Lines are written in submission order across several batches."""
+        for i in range(10):
+            writer.submit(f"line {i}\n")
+        writer.flush()
+
+        assert _read(log_path) == "".join(f"line {i}\n" for i in range(10))
+
+    def test_submit_after_close_writes_synchronously(self, writer, log_path):
+        """Lines logged after shutdown are not lost."""
+        writer.submit("before\n")
+        writer.flush_and_close()
+        writer.submit("after\n")
+
+        assert _read(log_path) == "before\nafter\n"
+
+    def test_surrogate_does_not_stop_writer(self, writer, log_path):
+        """Undecodable characters are escaped and later lines are still written."""
+        writer.submit("bad \udcff line\n")
+        writer.flush()
+        writer.submit("next\n")
+        writer.flush()
+
+        assert writer._thread.is_alive()
+        assert _read(log_path) == "bad \\udcff line\nnext\n"
+
+    def test_failed_batch_is_skipped(self, writer, log_path, monkeypatch):
+        """A batch that fails to write is dropped without stopping the thread."""
+        write = writer._write
+        monkeypatch.setattr(writer, "_write", lambda data: 1 / 0)
+        writer.submit("lost\n")
+        writer.flush()
+        monkeypatch.setattr(writer, "_write", write)
+        writer.submit("kept\n")
+        writer.flush()
+
+        assert writer._thread.is_alive()
+        assert _read(log_path) == "kept\n"
+
+    def test_fsync_coalesced_per_interval(self, log_path, monkeypatch):
+        """Batches written within one interval share a single fdatasync."""
+        synced = []
+        monkeypatch.setattr(activity_log.os, "fdatasync", synced.append)
+        w = _LogWriter(log_path, batch_size=2, fsync_interval=60)
+        for i in range(10):
+            w.submit(f"line {i}\n")
+        w.flush()
+        w.flush_and_close()
+
+        assert len(synced) == 1
+        assert _read(log_path) == "".join(f"line {i}\n" for i in range(10))
+
+    def test_sync_failure_is_not_reported_as_dropped(self, log_path, monkeypatch, caplog):
+        """A failing sync is logged as such; the written lines are kept."""
+        def fail(fd):
+            raise OSError("sync failed")
+
+        monkeypatch.setattr(activity_log.os, "fdatasync", fail)
+        w = _LogWriter(log_path, fsync_interval=60)
+        w.submit("kept\n")
+        w.flush_and_close()
+
+        assert "Could not sync activity log" in caplog.text
+        assert "Dropped" not in caplog.text
+        assert _read(log_path) == "kept\n"
+
+    def test_fsync_fallback_without_fdatasync(self, log_path, monkeypatch):
+        """Platforms without fdatasync (macOS) fall back to fsync."""
+        synced = []
+        monkeypatch.delattr(activity_log.os, "fdatasync", raising=False)
+        monkeypatch.setattr(activity_log.os, "fsync", synced.append)
+        w = _LogWriter(log_path, fsync_interval=60)
+        w.submit("line\n")
+        w.flush_and_close()
+
+        assert len(synced) == 1
+
+    def test_no_fsync_by_default(self, writer, monkeypatch):
+        """Without an interval the writer never syncs."""
+        synced = []
+        monkeypatch.setattr(activity_log.os, "fdatasync", synced.append)
+        writer.submit("line\n")
+        writer.flush_and_close()
+
+        assert synced == []
+
+
+class TestActivityLog:
+    """Test the public logging helpers."""
+
+    def test_user_message_visible_in_tail(self, writer):
+        """Queued lines are flushed before the tail is read."""
+        activity_log.log_user_message(42, "hello")
+        tail = activity_log.get_activity_log_tail(5)
+
+        assert "👤 USER (42): hello" in tail
+        assert "Last 1 of 1 entries" in tail
+
+    def test_timestamp_format(self):
+        """Timestamps keep the YYYY-MM-DD HH:MM:SS layout."""
+        assert re.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", activity_log._timestamp())
+
+    def test_timestamp_cache_refreshes_with_second(self, monkeypatch):
+        """A cached string is only reused for the second it was formatted in."""
+        monkeypatch.setattr(activity_log, "_last_ts", (0, "stale"))
+        ts = activity_log._timestamp()
+
+        assert ts != "stale"
+        assert activity_log._last_ts[1] == ts
+
+    def test_decorator_logs_named_params_and_result(self, writer, log_path):
+        """Positional and keyword arguments are logged by parameter name."""
+        @activity_log.log_tool_call
+        def add(a, b):
+            return a + b
+
+        assert add(1, b=2) == 3
+        writer.flush()
+
+        content = _read(log_path)
+        assert "🔧 add | a=1, b=2" in content
+        assert "✅ add → 3" in content
+
+    def test_tail_of_large_log(self, writer, log_path):
+        """Large logs are tailed from the end without reading every line."""
+        with open(log_path, "w", encoding="utf-8") as f:
+            for i in range(3000):
+                f.write(f"2026-01-01 00:00:00 | 🔧 run_shell: entry {i}\n")
+        assert os.path.getsize(log_path) > activity_log._TAIL_MMAP_MIN_SIZE
+
+        tail = activity_log.get_activity_log_tail(3)
+
+        assert "Last 3 of 3000 entries" in tail
+        assert tail.endswith("entry 2997\n2026-01-01 00:00:00 | 🔧 run_shell: entry 2998\n"
+                             "2026-01-01 00:00:00 | 🔧 run_shell: entry 2999\n")
+        assert "entry 2996" not in tail
+
+    def test_tail_splits_carriage_returns_like_small_logs(self, writer, log_path, monkeypatch):
+        """A stray \\r is not a line break on either the mmap or the full-read path."""
+        with open(log_path, "wb") as f:
+            for i in range(3000):
+                f.write(f"2026-01-01 00:00:00 | 🔧 run_shell: a\rb {i}\n".encode())
+        assert os.path.getsize(log_path) > activity_log._TAIL_MMAP_MIN_SIZE
+
+        mapped = activity_log._read_tail_lines(log_path, 3)
+        monkeypatch.setattr(activity_log, "_TAIL_MMAP_MIN_SIZE", float("inf"))
+        full = activity_log._read_tail_lines(log_path, 3)
+
+        assert mapped == full
+        assert mapped[1] == 3000
+        assert mapped[0][0] == "2026-01-01 00:00:00 | 🔧 run_shell: a\rb 2997\n".encode()
+
+    def test_context_manager_logs_params_and_result(self, writer, log_path):
+        """log_tool_call(name, params) works as a context manager."""
+        with activity_log.log_tool_call("run_shell", "ls -la") as tool_log:
+            tool_log.log_result("exit_code=0")
+        writer.flush()
+
+        content = _read(log_path)
+        assert "🔧 run_shell | ls -la" in content
+        assert "✅ run_shell → exit_code=0" in content
+
+    def test_context_manager_logs_errors(self, writer, log_path):
+        """Exceptions inside the block are logged and re-raised."""
+        with pytest.raises(ValueError):
+            with activity_log.log_tool_call("read_file", "/missing"):
+                raise ValueError("boom")
+        writer.flush()
+
+        assert "❌ read_file → ERROR: boom" in _read(log_path)
+
+    def test_named_decorator(self, writer, log_path):
+        """log_tool_call("name") decorates with a custom tool name."""
+        @activity_log.log_tool_call("custom")
+        def tool():
+            return "ok"
+
+        assert tool() == "ok"
+        writer.flush()
+
+        assert "🔧 custom\n" in _read(log_path)
+
+    def test_disabled_log_writes_nothing(self, writer, log_path, monkeypatch):
+        """AGENT_ACTIVITY_LOG=0 turns every helper into a no-op."""
+        monkeypatch.setattr(activity_log, "ACTIVITY_LOG_ENABLED", False)
+        activity_log.log_user_message(1, "hi")
+        activity_log.log_error("ctx", "err")
+        with activity_log.log_tool_call("run_shell", "ls") as tool_log:
+            tool_log.log_result("ok")
+
+        @activity_log.log_tool_call
+        def add(a, b):
+            return a + b
+
+        assert add(1, b=2) == 3
+        writer.flush()
+
+        assert not os.path.exists(log_path) or _read(log_path) == ""
+
+    def test_disabled_log_starts_no_writer(self):
+        """With AGENT_ACTIVITY_LOG=0 importing the module opens no file and starts no thread."""
+        code = (
+            "import threading\n"
+            "from agent import activity_log\n"
+            "assert activity_log._writer is None\n"
+            "assert not any(t.name == 'activity-log-writer' for t in threading.enumerate())\n"
+            "print(activity_log.get_activity_log_tail(1))\n"
+        )
+        env = {**os.environ, "AGENT_ACTIVITY_LOG": "0"}
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=env, timeout=60
+        )
+
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,50 @@
+"""Tests for queued root logging setup."""
+
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from agent import config
+
+
+@pytest.fixture
+def bare_root(tmp_path, monkeypatch):
+    """Root logger with LOG_FILE in a temp dir; handlers restored afterwards."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    monkeypatch.setattr(config, "LOG_FILE", str(tmp_path / "agent.log"))
+    monkeypatch.setattr(config.atexit, "register", lambda func: None)
+    yield root
+    config._stop_log_listener()
+    for handler in root.handlers:
+        handler.close()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+def test_root_only_enqueues(bare_root):
+    """Stream and file output both go through the listener thread."""
+    # pytest attaches its capture handler to root during the test call
+    bare_root.handlers.clear()
+    config.setup_logging()
+
+    assert [type(h) for h in bare_root.handlers] == [QueueHandler]
+    handler_types = {type(h) for h in config._log_listener.handlers}
+    assert handler_types == {logging.FileHandler, logging.StreamHandler}
+
+
+def test_records_after_stop_are_written(bare_root):
+    """Stopping the listener re-attaches its handlers to root."""
+    # pytest attaches its capture handler to root during the test call
+    bare_root.handlers.clear()
+    config.setup_logging()
+    config._stop_log_listener()
+
+    logging.getLogger("late").warning("after shutdown")
+    for handler in bare_root.handlers:
+        handler.flush()
+
+    assert not any(isinstance(h, QueueHandler) for h in bare_root.handlers)
+    with open(config.LOG_FILE, encoding="utf-8") as f:
+        assert "after shutdown" in f.read()
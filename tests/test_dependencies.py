@@ -276,3 +276,16 @@ async def test_agent_deps_runtime_state(session_db):
     assert deps.retry_count == 2
     assert deps.last_error == "Test error"
     assert deps.current_task == "Test task"
+
+
+@pytest.mark.asyncio
+async def test_agent_deps_uses_slots(session_db):
+    """AgentDeps has no per-instance __dict__ and rejects unknown attributes."""
+    from agent.dependencies import AgentDeps
+
+    session_id = await session_db.get_or_create_session(12345)
+    deps = AgentDeps(db=session_db, session_id=session_id, chat_id=12345)
+
+    assert not hasattr(deps, "__dict__")
+    with pytest.raises(AttributeError):
+        deps.unknown_attribute = 1
@@ -289,6 +289,20 @@ class TestProgressTrackerTelegram:
         await tracker.start_task("Test task")
         await asyncio.sleep(0.1)
 
+    @pytest.mark.asyncio
+    async def test_no_subscriber_skips_formatting(self, monkeypatch):
+        """Without a Telegram callback no update message is built."""
+        tracker = ProgressTracker(chat_id=456, is_cli=False)
+        to_string = MagicMock(return_value="")
+        monkeypatch.setattr(ProgressUpdate, "to_string", to_string)
+
+        await tracker.start_task("Silent task")
+        await tracker.complete()
+
+        to_string.assert_not_called()
+        assert tracker.get_status()["updates"] == 2
+        assert tracker.state == ProgressState.COMPLETED
+
 
 class TestProgressTrackerCLI:
     """Test ProgressTracker with CLI output."""
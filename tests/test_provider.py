@@ -4,6 +4,16 @@ import os
 from unittest.mock import patch, MagicMock
 import pytest
 
+from agent.core.agent import clear_agent_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_agent_cache():
+    """Model builders and session agents are process-wide caches; isolate each test."""
+    clear_agent_cache()
+    yield
+    clear_agent_cache()
+
 
 def test_build_vllm_model():
     """Test building vLLM model."""
@@ -115,3 +125,45 @@ def test_runner_with_provider():
             
             # Verify build_session_agent was called with provider
             mock_build.assert_called_once_with(provider="openrouter")
+
+
+def test_build_session_agent_shared_per_provider():
+    """Test that session agents are built once per provider and reused."""
+    from agent.core import agent as agent_module
+
+    with patch("agent.core.agent.OPENROUTER_API_KEY", "test-key"), \
+         patch("agent.core.agent.create_agent",
+               side_effect=lambda provider: MagicMock()) as mock_create:
+        first = agent_module.build_session_agent(provider="vllm")
+        second = agent_module.build_session_agent(provider="VLLM")
+        other = agent_module.build_session_agent(provider="openrouter")
+
+    assert first is second
+    assert other is not first
+    assert mock_create.call_count == 2
+
+
+def test_build_session_agent_openrouter_without_key_reuses_vllm():
+    """Test that the OpenRouter fallback shares the vLLM session agent."""
+    from agent.core import agent as agent_module
+
+    with patch("agent.core.agent.OPENROUTER_API_KEY", ""), \
+         patch("agent.core.agent.create_agent",
+               side_effect=lambda provider: MagicMock()) as mock_create:
+        fallback = agent_module.build_session_agent(provider="openrouter")
+        vllm = agent_module.build_session_agent(provider="vllm")
+
+    assert fallback is vllm
+    mock_create.assert_called_once_with(provider="vllm")
+
+
+def test_clear_agent_cache_rebuilds_models():
+    """Test that clear_agent_cache drops cached models."""
+    from agent.core.agent import build_vllm_model
+
+    with patch("agent.core.agent.OpenAIProvider"):
+        with patch("agent.core.agent.OpenAIChatModel", side_effect=lambda **kwargs: MagicMock()):
+            first = build_vllm_model(model_name="cache-model")
+            assert build_vllm_model(model_name="cache-model") is first
+            clear_agent_cache()
+            assert build_vllm_model(model_name="cache-model") is not first
@@ -76,3 +76,101 @@ async def test_run_gives_up_after_max_retries():
             assert "2" in out
             assert "persistent fail" in out
             assert mock_agent.run.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_simple_task_reuses_session_agent():
+    """run_simple_task uses the shared agent when no model is requested."""
+    from agent.core.runner import run_simple_task
+
+    with patch("agent.core.agent.build_session_agent") as mock_build, \
+         patch("agent.core.agent.build_agent") as mock_build_agent:
+        mock_agent = AsyncMock()
+        mock_agent.run.return_value = MagicMock(output="simple")
+        mock_build.return_value = mock_agent
+
+        assert await run_simple_task("task", provider="vllm") == "simple"
+        mock_build.assert_called_once_with(provider="vllm")
+        mock_build_agent.assert_not_called()
+
+
+@pytest.mark.parametrize("task", ["status", "  STATUS\n", "run status", "Run agent Status"])
+def test_is_status_task(task):
+    """Built-in status task is recognised regardless of case and padding."""
+    from agent.core.runner import _is_status_task
+
+    assert _is_status_task(task)
+
+
+@pytest.mark.parametrize(
+    "task", ["", "statuses", "run", "run the tests", "show status", "status" + "x" * 5000]
+)
+def test_is_not_status_task(task):
+    """Other tasks go to the agent."""
+    from agent.core.runner import _is_status_task
+
+    assert not _is_status_task(task)
+
+
+@pytest.mark.asyncio
+async def test_status_task_skips_agent():
+    """The status shortcut answers without building an agent."""
+    from agent.core.runner import run_with_retry
+
+    with patch("agent.core.agent.build_session_agent") as mock_build:
+        out = await run_with_retry("run status")
+
+    assert out.startswith("Agent status: idle")
+    mock_build.assert_not_called()
+
+
+def test_unwrap_output():
+    """Run results are reduced to their text output."""
+    from agent.core.runner import _unwrap_output
+
+    result = MagicMock()
+    result.output = "done"
+    assert _unwrap_output(result) == "done"
+    assert _unwrap_output("fallback text") == "fallback text"
+    assert _unwrap_output(42) == "42"
+
+
+def test_repair_goal_keeps_braces_in_task():
+    """Task and error text are inserted verbatim, braces included."""
+    from agent.core.runner import AUTO_REPAIR_TASK_PREFIX, _build_repair_goal
+
+    goal = _build_repair_goal("print {x}", "KeyError: '{y}'", "x" * 4000, 2)
+
+    assert goal.startswith(f"{AUTO_REPAIR_TASK_PREFIX} The previous run failed after 2 attempt(s).")
+    assert "Original goal:\nprint {x}\n\n" in goal
+    assert "Last error:\nKeyError: '{y}'\n\n" in goal
+    assert "x" * 3000 + "\n... [truncated]\n\n" in goal
+    assert goal.endswith("Fix the error and complete or report progress.")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("task", ["", "   ", "\n\t"])
+async def test_empty_task_skips_setup(task):
+    """Whitespace-only tasks return without touching the session DB or agent."""
+    from agent.core.runner import run_with_retry
+
+    with patch("agent.core.agent.build_session_agent") as mock_build, \
+            patch("agent.core.runner.AgentDeps") as mock_deps_class:
+        out = await run_with_retry(task)
+
+    assert out == "Empty task: nothing to do."
+    mock_build.assert_not_called()
+    mock_deps_class.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_empty_resumable_task_is_settled():
+    """An empty resumable task is marked failed instead of staying pending."""
+    from agent.core.runner import run_with_retry
+
+    mock_db = MagicMock()
+    mock_db.mark_resumable_task_failed = AsyncMock()
+    with patch("agent.core.runner.get_db", AsyncMock(return_value=mock_db)):
+        out = await run_with_retry("  ", resumable_task_id=7)
+
+    mock_db.mark_resumable_task_failed.assert_awaited_once_with(7, out)
@@ -77,3 +77,16 @@ async def test_get_messages_under_lock(session_db):
     assert len(messages) == 10
     for i, m in enumerate(messages):
         assert m.content == f"msg_{i}"
+
+
+@pytest.mark.asyncio
+async def test_session_db_connection_pragmas(session_db):
+    """Connection runs in WAL mode with NORMAL sync and a busy timeout."""
+    async def pragma(name):
+        async with session_db._db.execute(f"PRAGMA {name}") as cursor:
+            return (await cursor.fetchone())[0]
+
+    assert (await pragma("journal_mode")).lower() == "wal"
+    assert await pragma("synchronous") == 1  # NORMAL
+    assert await pragma("busy_timeout") == 5000
+    assert await pragma("temp_store") == 2  # MEMORY
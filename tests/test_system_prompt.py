@@ -0,0 +1,22 @@
+"""Tests for the agent system prompt and tool registration order."""
+
+import re
+
+from agent.core.agent import SYSTEM_PROMPT
+from agent.tools import ALL_TOOLS
+
+
+def _prompt_tool_names() -> list[str]:
+    """Tool names in the order the system prompt lists them."""
+    section = SYSTEM_PROMPT.split("Tools:\n", 1)[1].split("\n\nRules:", 1)[0]
+    names = []
+    for line in section.splitlines():
+        head = line.removeprefix("- ").split(":", 1)[0]
+        names.extend(re.sub(r"\(.*\)", "", name).strip() for name in head.split(" / "))
+    return names
+
+
+def test_tool_order_matches_system_prompt():
+    """ALL_TOOLS is registered in the same order the prompt lists the tools."""
+    assert [tool.__name__ for tool in ALL_TOOLS] == _prompt_tool_names()
+
@@ -0,0 +1,19 @@
+"""Tests for Telegram bot startup: session agent prewarm."""
+
+from unittest.mock import patch
+
+from agent.interfaces import telegram
+
+
+def test_prewarm_builds_current_provider_agent():
+    """Startup prewarm builds the session agent for the bot's provider."""
+    with patch("agent.core.agent.build_session_agent") as mock_build:
+        telegram._prewarm_agent()
+
+    mock_build.assert_called_once_with(provider=telegram._current_provider)
+
+
+def test_prewarm_failure_does_not_stop_bot():
+    """A failed prewarm is logged, not raised."""
+    with patch("agent.core.agent.build_session_agent", side_effect=RuntimeError("no model")):
+        telegram._prewarm_agent()